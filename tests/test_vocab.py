@@ -36,6 +36,28 @@ def test_vocab_no_counts():
     assert vc.wordcount == (("apple", 1), ("banana", 1), ("cherry", 1))
 
 
+def test_vocab_counts_read_only():
+    test_data = "apple\t5\nbanana\t3"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    assert list(vc.counts) == [5, 3]
+    with pytest.raises(TypeError):
+        vc.counts[0] = 999
+    assert vc.filter(min_wl=1) == (("apple", 5), ("banana", 3))
+
+
+def test_vocab_data_file_change(tmp_path):
+    a = tmp_path / "a.tsv"
+    b = tmp_path / "b.tsv"
+    a.write_text("apple\t5", encoding="utf8")
+    b.write_text("zebra\t3", encoding="utf8")
+    vc = Vocab(bicameral=True, lang="en", data_file=str(a))
+    assert vc.filter() == (("apple", 5),)
+
+    vc.data_file = str(b)
+    assert vc.filter() == (("zebra", 3),)
+
+
 def test_vocab_filter_glyphs_raises_filtererror():
     test_data = "apple\t5\nbanana\t3\ncherry\t2"
     vc = Vocab(bicameral=True, lang="en", data=test_data)
@@ -150,6 +172,14 @@ def test_vocab_filter_case_lc():
     assert vc.filter(case="lc") == (("grape", 1), ("apple", 2))
 
 
+def test_vocab_filter_case_lc_non_ascii():
+    test_data = "über\t1\nÜber\t2\nañejo\t3\nBart\t4"
+    vc = Vocab(bicameral=True, lang="es", data=test_data)
+
+    assert vc.filter(case="lc") == (("über", 1), ("añejo", 3))
+    assert vc.filter(case="cap_og") == (("Über", 2), ("Bart", 4))
+
+
 def test_vocab_filter_case_lc_force():
     test_data = "grape\t1\napple\t2\nApple\t3\nBart\t4\nBART\t5\nDDoS\t6"
     vc = Vocab(bicameral=True, lang="en", data=test_data)
@@ -306,6 +336,43 @@ def test_vocab_filter_contains():
     )
 
 
+def test_vocab_filter_contains_multiple():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2\ndate\t1\nelderberry\t4"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    # every substring must be present, in any order, duplicates are harmless
+    assert vc.filter(contains=("e", "err", "e")) == (
+        ("cherry", 2),
+        ("elderberry", 4),
+    )
+
+
+def test_vocab_filter_contains_list():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2\ndate\t1\nelderberry\t4"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    assert vc.filter(contains=["e", "r"]) == vc.filter(contains=("e", "r"))
+
+
+def test_vocab_filter_contains_not_alpha_raises_valueerror():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    with pytest.raises(ValueError):
+        vc.filter(contains=("a", 1))
+    with pytest.raises(ValueError):
+        vc.filter(inner=["a", "n1"])
+
+
+def test_vocab_filter_contains_order_shares_cache():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2\ndate\t1\nelderberry\t4"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    # same substrings in any order (or repeated) hit the same cached result
+    assert vc.filter(contains=("e", "r")) is vc.filter(contains=["r", "e", "r"])
+    assert vc.filter(inner=("e", "r")) is vc.filter(inner=("r", "e"))
+
+
 def test_vocab_filter_inner():
     test_data = "apple\t5\nbanana\t3\ncherry\t2\ndate\t1\nelderberry\t4"
     vc = Vocab(bicameral=True, lang="en", data=test_data)
@@ -329,3 +396,55 @@ def test_vocab_filter_regex():
 
     # check for 2 of any letter
     assert vc.filter(regexp="e.*d.*.rr.*") == (("elderberry", 4),)
+
+
+def test_vocab_filter_regex_alternation_matches_whole_word():
+    test_data = "apple\t5\na\t4\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    # the whole word has to match one of the alternatives, not just its start
+    assert vc.filter(regexp="a|b.*") == (("a", 4), ("banana", 3))
+
+
+def test_vocab_filter_regex_anchors():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    assert vc.filter(regexp="app.*$") == (("apple", 5),)
+    assert vc.filter(regexp="^b.*") == (("banana", 3),)
+
+
+def test_vocab_filter_regex_capture_groups():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    assert vc.filter(regexp="(a)(p)p.*") == (("apple", 5),)
+    assert vc.filter(regexp="b(an)+a") == (("banana", 3),)
+
+
+def test_vocab_filter_glyphs_order_shares_cache():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    assert vc.filter(glyphs="aple") == (("apple", 5),)
+    assert vc.filter(glyphs="aple") is vc.filter(glyphs="elppa")
+
+
+def test_vocab_filter_error_shows_arguments_as_passed():
+    test_data = "apple\t5\nbanana\t3\ncherry\t2"
+    vc = Vocab(bicameral=True, lang="en", data=test_data)
+
+    with pytest.raises(FilterError, match="glyphs='zyx'"):
+        vc.filter(glyphs="zyx", case="lc")
+    with pytest.raises(FilterError, match=r"contains='\('r', 'a'\)'"):
+        vc.filter(contains=["r", "a"])
+
+
+def test_vocab_filter_glyphs_special_chars():
+    test_data = "ab\t2\ncd\t1"
+    vc = Vocab(bicameral=False, lang="en", data=test_data)
+
+    # glyphs are escaped, so they aren't interpreted as character class syntax
+    assert vc.filter(glyphs="^ab") == (("ab", 2),)
+    with pytest.raises(FilterError):
+        vc.filter(glyphs="a-d")
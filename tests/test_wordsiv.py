@@ -1,8 +1,13 @@
 import pytest
 from wordsiv import WordSiv, FilterError, Vocab
+from wordsiv import _sampling_table, _sample_word, _MAX_SAMPLING_TABLES
 from unittest.mock import create_autospec
+import random
 import string
 import re
+import os
+import subprocess
+import sys
 
 
 @pytest.fixture
@@ -162,6 +167,36 @@ def test_words_top_k(wsv):
     assert "cat" not in wsv.words(top_k=2, n_words=100)
 
 
+def test_sampling_table_per_rnd_and_top_k(wsv):
+    wc = wsv.get_vocab("test").filter()
+
+    table = _sampling_table(wc, 0, 0)
+    assert table == (("apple", "banana", "cat"), (3.0, 5.0, 6.0))
+    assert _sampling_table(wc, 0, 0) is table
+    assert _sampling_table(wc, 0, 2) == (("apple", "banana"), (3.0, 5.0))
+    # counts interpolated halfway to the max count: 3, 2.5, 2
+    assert _sampling_table(wc, 0.5, 0) == (("apple", "banana", "cat"), (3.0, 5.5, 7.5))
+
+
+def test_sampling_table_eviction(wsv):
+    wc = wsv.get_vocab("test").filter()
+    table = _sampling_table(wc, 0.1, 0)
+    for i in range(_MAX_SAMPLING_TABLES):
+        _sampling_table(wc, 0.2 + i / 100, 0)
+
+    assert len(wc.sampling_tables) == _MAX_SAMPLING_TABLES
+    assert (0.1, 0) not in wc.sampling_tables
+
+    # a rebuilt table gives the same draws as random.choices
+    rand1, rand2 = random.Random(1), random.Random(1)
+    words = [_sample_word(wc, rand1, 0.1) for _ in range(50)]
+    assert _sampling_table(wc, 0.1, 0) == table
+    weights = [(1 - 0.1) * c + 0.1 * 3 for c in (3, 2, 1)]
+    assert words == [
+        rand2.choices(["apple", "banana", "cat"], weights=weights)[0] for _ in range(50)
+    ]
+
+
 def test_words_numbers_out_of_range_raises_valueerror(wsv):
     with pytest.raises(ValueError):
         wsv.words(numbers=1.1)
@@ -246,6 +281,24 @@ def test_seed_reproduces_same_output(wsv, function, seed):
     assert f(seed=seed) == f(seed=seed)
 
 
+def test_seed_reproduces_same_punctuation_across_processes():
+    # punctuation options must not depend on hash randomization (PYTHONHASHSEED)
+    code = (
+        "from wordsiv import WordSiv; "
+        "print(WordSiv(vocab='en', seed=1).sents(n_sents=5, rnd_punc=0.5))"
+    )
+    outputs = [
+        subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONHASHSEED": str(hash_seed)},
+        ).stdout
+        for hash_seed in range(3)
+    ]
+    assert outputs[0] and outputs[0] == outputs[1] == outputs[2]
+
+
 @pytest.mark.parametrize("n_sents", [1, 2, 10, 20])
 def test_sentences_n_sents(wsv, n_sents):
     assert len(wsv.sents(n_sents=n_sents)) == n_sents
@@ -4,14 +4,16 @@ from __future__ import annotations
 
 from functools import lru_cache
 from itertools import accumulate
+from operator import itemgetter
 import logging
 import random
 import json
 from importlib import resources
 from typing import Sequence
 from ._vocab import Vocab, VocabFormatError, VocabEmptyError
-from ._filter import FilterError, CaseType
+from ._filter import FilterError, CaseType, _case_glyphs
 from ._punctuation import DEFAULT_PUNCTUATION, _punctuate
+from ._choices import _choice_cum
 from . import _vocab_data
 
 __all__ = [
@@ -26,6 +28,7 @@ __all__ = [
 log = logging.getLogger(__name__)
 
 _DEFAULT_MAX_NUM_LENGTH = 4
+_NUMERALS = "0123456789"
 _DEFAULT_VOCABS = {
     "ar": ("ar_subs_meta.json", "ar_subs.tsv"),
     "en": ("en_books_meta.json", "en_books.tsv"),
@@ -34,11 +37,13 @@ _DEFAULT_VOCABS = {
 }
 
 
-@lru_cache(maxsize=None)
 def _accumulate_weights(counts: tuple[float, ...]) -> tuple[float, ...]:
     """
-    Accumulate a tuple of numeric weights and return the cumulative sums and cache the
-    result.
+    Accumulate a tuple of numeric weights and return the cumulative sums as floats.
+
+    The draw compares a float against these sums, and float-to-float comparisons are
+    much faster than float-to-int. Integer sums are accumulated exactly first, so the
+    draw is the same as with the integer sums.
 
     Args:
         counts (tuple[float, ...]): A tuple of numeric values representing weights.
@@ -46,16 +51,14 @@ def _accumulate_weights(counts: tuple[float, ...]) -> tuple[float, ...]:
     Returns:
         tuple[float, ...]: A tuple of cumulative sums of the input weights.
     """
-    return tuple(accumulate(counts))
+    return tuple(map(float, accumulate(counts)))
 
 
-@lru_cache(maxsize=None)
 def _split_wordcount(
     word_count: tuple[tuple[str, int], ...],
 ) -> tuple[tuple[str, ...], tuple[int, ...]]:
     """
     Split a tuple of (word, count) pairs into two tuples—one of words, one of counts.
-    Cache results.
 
     Args:
         word_count (tuple[tuple[str, int], ...]): A tuple of (word, count) pairs.
@@ -65,10 +68,10 @@ def _split_wordcount(
             - A tuple of words.
             - A tuple of corresponding counts.
     """
-    return tuple(i[0] for i in word_count), tuple(i[1] for i in word_count)
+    # two C-level passes, rather than unpacking every pair into zip's arguments
+    return tuple(map(itemgetter(0), word_count)), tuple(map(itemgetter(1), word_count))
 
 
-@lru_cache(maxsize=None)
 def _interpolate_counts(counts: tuple[float, ...], rnd: float) -> tuple[float, ...]:
     """
     Interpolate counts with a random distribution factor.
@@ -80,13 +83,98 @@ def _interpolate_counts(counts: tuple[float, ...], rnd: float) -> tuple[float, .
     Returns:
         tuple[float, ...]: A tuple of adjusted counts.
     """
-    max_count = max(counts)
-    adjusted_counts = tuple((1 - rnd) * c + rnd * max_count for c in counts)
+    # same arithmetic as (1 - rnd) * c + rnd * max_count, with the constant parts hoisted
+    scale = 1 - rnd
+    offset = rnd * max(counts)
+    adjusted_counts = tuple(scale * c + offset for c in counts)
     return adjusted_counts
 
 
+@lru_cache(maxsize=4096)
+def _available_numerals(glyphs: str | None) -> str:
+    """
+    Get the numerals we can display with glyphs (all of them if glyphs isn't set), and
+    cache the result.
+
+    Args:
+        glyphs (str | None): A string of allowed glyphs.
+
+    Returns:
+        str: A string of the available numerals.
+    """
+    if glyphs:
+        return "".join([n for n in _NUMERALS if n in glyphs])
+    return _NUMERALS
+
+
+# Most sampling tables we keep for each result of Vocab.filter (different rnd/top_k)
+_MAX_SAMPLING_TABLES = 8
+
+
+def _sampling_table(
+    word_count: tuple[tuple[str, float], ...], rnd: float, top_k: int
+) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """
+    Get the words and cumulative weights for sampling from a tuple of (word, count)
+    pairs. Results of Vocab.filter keep their tables, so they're only built once per
+    filter result, rnd and top_k.
+
+    Args:
+        word_count (tuple[tuple[str, float], ...]): A tuple of (word, count) pairs.
+        rnd (float): A randomness factor between 0 and 1.
+        top_k (int): Only sample from the first `top_k` pairs, if not 0.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[float, ...]]:
+            - A tuple of words.
+            - A tuple of the corresponding cumulative weights.
+    """
+    tables = getattr(word_count, "sampling_tables", None)
+    if tables is None:
+        # not a filter result (e.g. a plain tuple), so there's nowhere to keep the table
+        return _build_sampling_table(word_count, rnd, top_k)
+
+    key = (rnd, top_k)
+    table = tables.pop(key, None)
+    if table is None:
+        table = _build_sampling_table(word_count, rnd, top_k)
+        if len(tables) >= _MAX_SAMPLING_TABLES:
+            # drop the least recently used table (dicts keep insertion order)
+            del tables[next(iter(tables))]
+    # (re)insert, so the most recently used table is last
+    tables[key] = table
+
+    return table
+
+
+def _build_sampling_table(
+    word_count: tuple[tuple[str, float], ...], rnd: float, top_k: int
+) -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """
+    Build the words and cumulative weights for sampling from a tuple of (word, count)
+    pairs.
+
+    Args:
+        word_count (tuple[tuple[str, float], ...]): A tuple of (word, count) pairs.
+        rnd (float): A randomness factor between 0 and 1.
+        top_k (int): Only sample from the first `top_k` pairs, if not 0.
+
+    Returns:
+        tuple[tuple[str, ...], tuple[float, ...]]:
+            - A tuple of words.
+            - A tuple of the corresponding cumulative weights.
+    """
+    words, counts = _split_wordcount(word_count[:top_k] if top_k else word_count)
+    if rnd:
+        counts = _interpolate_counts(counts, rnd)
+    return words, _accumulate_weights(counts)
+
+
 def _sample_word(
-    word_count: tuple[tuple[str, float], ...], rand: random.Random, rnd: float
+    word_count: tuple[tuple[str, float], ...],
+    rand: random.Random,
+    rnd: float,
+    top_k: int = 0,
 ) -> str:
     """
     Sample a word from a list of (word, count) pairs, using counts as weights.
@@ -95,15 +183,14 @@ def _sample_word(
         word_count (tuple[tuple[str, float], ...]): A tuple of (word, count) pairs.
         rand (random.Random): A `random.Random` instance.
         rnd (float): A randomness factor between 0 and 1.
+        top_k (int): Only sample from the first `top_k` pairs, if not 0.
 
     Returns:
         str: A randomly chosen word from `word_count`.
     """
-    words, counts = _split_wordcount(word_count)
-    adjusted_counts = _interpolate_counts(counts, rnd)
-    accumulated_counts = _accumulate_weights(adjusted_counts)
+    words, accumulated_counts = _sampling_table(word_count, rnd, top_k)
 
-    return rand.choices(words, cum_weights=accumulated_counts)[0]
+    return _choice_cum(rand, words, accumulated_counts)
 
 
 class WordSiv:
@@ -274,18 +361,15 @@ class WordSiv:
                 raise ValueError("'min_wl' must be less than or equal to 'max_wl'")
             length = self._rand.randint(min_wl, max_wl)
 
-        available_numerals = "".join(str(n) for n in range(0, 10))
-        if glyphs:
-            available_numerals = "".join(n for n in available_numerals if n in glyphs)
-
-            if not available_numerals:
-                if raise_errors:
-                    raise FilterError("No numerals available in glyphs")
-                else:
-                    log.warning("No numerals available in glyphs")
-                    return ""
+        available_numerals = _available_numerals(glyphs)
+        if not available_numerals:
+            if raise_errors:
+                raise FilterError("No numerals available in glyphs")
+            else:
+                log.warning("No numerals available in glyphs")
+                return ""
 
-        return "".join(self._rand.choice(available_numerals) for _ in range(length))
+        return "".join([self._rand.choice(available_numerals) for _ in range(length)])
 
     def word(
         self,
@@ -371,10 +455,7 @@ class WordSiv:
                 log.warning("%s", e.args[0])
                 return ""
 
-        if top_k:
-            wc_list = wc_list[:top_k]
-
-        return _sample_word(wc_list, self._rand, rnd)
+        return _sample_word(wc_list, self._rand, rnd, top_k)
 
     def top_word(
         self,
@@ -530,7 +611,7 @@ class WordSiv:
         if cap_first is None:
             if glyphs:
                 # If constrained glyphs, only capitalize if uppercase letters exist
-                cap_first = any(c for c in glyphs if c.isupper())
+                cap_first = bool(_case_glyphs(glyphs)[0])
             else:
                 # Otherwise, default to capitalize the first word
                 cap_first = True
@@ -538,6 +619,12 @@ class WordSiv:
         if not (0 <= numbers <= 1):
             raise ValueError("'numbers' must be between 0 and 1")
 
+        # Choosing between a word and a number for each token is the same draw as
+        # rand.choices(["word", "number"], weights=[1 - numbers, numbers])[0], so seeded
+        # results are the same, with the cumulative weights worked out once
+        word_weight = 1 - numbers
+        total_weight = word_weight + numbers
+
         word_list = []
         last_w = None
         for i in range(n_words):
@@ -546,12 +633,7 @@ class WordSiv:
             else:
                 word_case = case
 
-            token_type = self._rand.choices(
-                ["word", "number"],
-                weights=[1 - numbers, numbers],
-            )[0]
-
-            if token_type == "word":
+            if self._rand.random() * total_weight < word_weight:
                 w = self.word(
                     vocab=vocab,
                     glyphs=glyphs,
@@ -584,7 +666,7 @@ class WordSiv:
                     word_list.append(w)
                     last_w = w
             else:
-                # token_type == "number"
+                # number
                 w = self.number(
                     glyphs=glyphs,
                     wl=wl,
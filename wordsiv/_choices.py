@@ -0,0 +1,40 @@
+"""
+Weighted random choice with precomputed cumulative weights.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect
+from math import isfinite
+import random
+from typing import Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def _choice_cum(
+    rand: random.Random, population: Sequence[T], cum_weights: Sequence[float]
+) -> T:
+    """
+    Choose one item from population, weighted by cumulative weights.
+
+    This is the draw that `rand.choices(population, cum_weights=cum_weights)[0]` makes,
+    so seeded results are the same, without the per-call setup of `random.choices`.
+    It's meant for weights that are cached, so we only check them when they're bad.
+
+    Args:
+        rand (random.Random): A `random.Random` instance.
+        population (Sequence[T]): The items to choose from.
+        cum_weights (Sequence[float]): The cumulative weights of the items.
+
+    Returns:
+        T: The chosen item.
+    """
+    total = cum_weights[-1] + 0.0
+    if not (total > 0.0 and isfinite(total)):
+        # let random.choices raise its usual error about the weights
+        return rand.choices(population, cum_weights=cum_weights)[0]
+
+    return population[
+        bisect(cum_weights, rand.random() * total, 0, len(population) - 1)
+    ]
@@ -2,9 +2,15 @@
 Filter words in a wordcount string.
 """
 
+from __future__ import annotations
+
 from typing import Literal
 
+from array import array
 from functools import lru_cache
+from itertools import compress, repeat
+from operator import eq, ge
+import re
 import regex
 
 
@@ -12,6 +18,18 @@ class FilterError(Exception):
     pass
 
 
+class _FilterResult(tuple):
+    """
+    The result of a filter: a tuple of (word, count) pairs, which also keeps the sampling
+    tables built from it, so they're cached for exactly as long as the result is.
+    """
+
+    def __new__(cls, pairs):
+        self = super().__new__(cls, pairs)
+        self.sampling_tables = {}
+        return self
+
+
 CaseType = Literal[
     "any",
     "any_og",
@@ -31,29 +49,43 @@ option
 """
 
 
-@lru_cache(maxsize=None)
-def _filter_wordcount(wc_str, bicameral, glyphs=None, case="any", **kwargs):
+# Filter results (and the case/glyph stages below) can be as big as the vocab: ~8MB for
+# an unfiltered en result. Their caches only keep a few dozen entries, enough for the
+# filters a session switches between, so trying lots of glyphs doesn't grow memory.
+_MAX_FILTER_RESULTS = 32
+
+
+@lru_cache(maxsize=_MAX_FILTER_RESULTS)
+def _filter_wordcount(
+    wc_str,
+    bicameral,
+    glyphs=None,
+    case="any",
+    min_wl=0,
+    max_wl=None,
+    wl=None,
+    contains=None,
+    inner=None,
+    startswith=None,
+    endswith=None,
+    regexp=None,
+):
+    # called positionally by Vocab.filter, so lru_cache sees one key per filter
+    params = (min_wl, max_wl, wl, contains, inner, startswith, endswith, regexp)
+
     if bicameral and glyphs and case == "any":
         try:
-            return _filter_all_params(
-                wc_str, bicameral, glyphs=glyphs, case="any_og", **kwargs
-            )
+            return _filter_all_params(wc_str, bicameral, glyphs, "any_og", *params)
         except FilterError:
             try:
-                return _filter_all_params(
-                    wc_str, bicameral, glyphs=glyphs, case="cap", **kwargs
-                )
+                return _filter_all_params(wc_str, bicameral, glyphs, "cap", *params)
             except FilterError:
-                return _filter_all_params(
-                    wc_str, bicameral, glyphs=glyphs, case="uc", **kwargs
-                )
+                return _filter_all_params(wc_str, bicameral, glyphs, "uc", *params)
 
     elif case == "any":
-        return _filter_all_params(
-            wc_str, bicameral, glyphs=glyphs, case="any_og", **kwargs
-        )
+        return _filter_all_params(wc_str, bicameral, glyphs, "any_og", *params)
     else:
-        return _filter_all_params(wc_str, bicameral, glyphs=glyphs, case=case, **kwargs)
+        return _filter_all_params(wc_str, bicameral, glyphs, case, *params)
 
 
 def _filter_all_params(
@@ -71,14 +103,12 @@ def _filter_all_params(
     regexp=None,
 ):
     # it's faster to filter case first, we just need to do it at the end for 'any'
-    wc_list_cased = _filter_case(wc_str, case, glyphs, bicameral)
-    if not wc_list_cased:
+    words, counts = _filter_case(wc_str, case, glyphs, bicameral)
+    if not words:
         raise FilterError(f"No words for case='{case}', glyphs='{glyphs}'")
-    else:
-        wc_str_cased = "\n".join(wc_list_cased)
 
     wc_tuple = _filter_wl_substr(
-        wc_str_cased, min_wl, max_wl, wl, contains, inner, startswith, endswith, regexp
+        words, counts, min_wl, max_wl, wl, contains, inner, startswith, endswith, regexp
     )
     if not wc_tuple:
         raise FilterError(
@@ -99,88 +129,132 @@ def _check_wc_empty(wc_list, filter_name, details=""):
 
 
 def _filter_wl_substr(
-    wc_str, min_wl, max_wl, wl, contains, inner, startswith, endswith, regexp
+    words, counts, min_wl, max_wl, wl, contains, inner, startswith, endswith, regexp
 ):
-    pattern = "^"
+    # words and counts are parallel sequences (SoA). Each filter builds a mask over the
+    # remaining words with map() (so the loop runs in C rather than in Python bytecode)
+    # and narrows the words and their indices with it. Pairs are only built at the end.
+    indices = range(len(words))
+
     if startswith:
         _check_alpha(startswith, "startswith")
-        pattern += rf"(?={startswith}.*)"
+        words, indices = _compress(
+            words, indices, map(str.startswith, words, repeat(startswith))
+        )
 
     if endswith:
         _check_alpha(endswith, "endswith")
-        pattern += rf"(?=.*{endswith}\t)"
+        words, indices = _compress(
+            words, indices, map(str.endswith, words, repeat(endswith))
+        )
 
     if contains:
-        if isinstance(contains, tuple):
-            for c in contains:
-                _check_alpha(c, "contains")
-                pattern += rf"(?=.*{c}.*\t)"
-        else:
-            _check_alpha(contains, "contains")
-            pattern += rf"(?=.*{contains}.*\t)"
+        for c in _substrings(contains):
+            words, indices = _compress(
+                words, indices, map(str.__contains__, words, repeat(c))
+            )
 
     if inner:
-        if isinstance(inner, tuple):
-            for i in inner:
-                _check_alpha(i, "inner")
-                pattern += rf"(?=.+{i}.+\t)"
-        else:
-            _check_alpha(inner, "inner")
-            pattern += rf"(?=.+{inner}.+\t)"
+        for n in _substrings(inner):
+            words, indices = _compress(words, indices, (n in w[1:-1] for w in words))
 
     # filter by word length
     if wl:
         _check_pos_int(wl, "wl")
-        pattern += rf"(?=.{{{wl}}}\t)"
+        words, indices = _compress(words, indices, map(eq, map(len, words), repeat(wl)))
     elif min_wl or max_wl:
         # min wl is just 0 by default
         _check_pos_int(min_wl, "min_wl")
 
-        # max wl we need an empty string if it's not set
-        if not max_wl:
-            max_wl_str = ""
-        else:
+        if max_wl:
+            # check both bounds in a single pass
             _check_pos_int(max_wl, "max_wl")
-            max_wl_str = max_wl
+            in_bounds = range(min_wl, max_wl + 1).__contains__
+            mask = map(in_bounds, map(len, words))
+        else:
+            # no upper bound if max_wl isn't set
+            mask = map(ge, map(len, words), repeat(min_wl))
 
-        pattern += rf"(?=.{{{min_wl},{max_wl_str}}}\t)"
+        words, indices = _compress(words, indices, mask)
 
     # filter with regex
     if regexp:
-        pattern += rf"(?={regexp}\t)"
+        fullmatch = _compile(rf"(?:{regexp})").fullmatch
+        words, indices = _compress(words, indices, map(fullmatch, words))
+
+    if len(indices) == len(counts):
+        # nothing was filtered out, so the counts are still parallel to the words
+        return _FilterResult(zip(words, counts))
+
+    return _FilterResult(zip(words, map(counts.__getitem__, indices)))
 
-    pattern += r".*$"
 
-    compiled = regex.compile(pattern, regex.MULTILINE)
-    lines = compiled.findall(wc_str)
+def _normalize_substrings(value, name):
+    """
+    Check the substrings for a contains/inner filter. Several substrings are returned as
+    a sorted tuple without duplicates: order and duplicates don't change the result, so
+    the same substrings always use the same cache entry.
+    """
+    if not isinstance(value, (list, tuple)):
+        if value:
+            _check_alpha(value, name)
+        return value
+
+    for s in value:
+        _check_alpha(s, name)
+    return tuple(sorted(set(value)))
+
+
+def _substrings(value):
+    """
+    Return the (normalized) substrings for a contains/inner filter, longest first: longer
+    substrings tend to match fewer words, so the later passes have fewer words to scan.
+    """
+    substrings = value if isinstance(value, tuple) else (value,)
+    return sorted(substrings, key=len, reverse=True)
+
+
+def _compress(words, indices, mask):
+    """
+    Keep only the words (and their indices) where mask is true.
+    """
+    mask = list(mask)
+    return list(compress(words, mask)), list(compress(indices, mask))
+
 
-    return tuple((line.split()[0], int(line.split()[1])) for line in lines)
+@lru_cache(maxsize=None)
+def _wordcount_str_to_soa(wc_str: str) -> tuple[tuple[str, ...], array]:
+    """
+    Split a wordcount string into a tuple of words and a parallel array of counts.
+    """
+    # a single split of the whole string gives alternating words and counts
+    parts = wc_str.split()
+    return tuple(parts[0::2]), array("Q", map(int, parts[1::2]))
 
 
 def _filter_case(wc_str, case, glyphs, bicameral):
     if not bicameral:
         if glyphs:
-            return _findall_recase(wc_str, f"[{glyphs}]+")
+            return _findall_glyphs(wc_str, glyphs)
         else:
-            return wc_str.splitlines()
+            return _wordcount_str_to_soa(wc_str)
     else:
         if glyphs:
-            uc_glyphs = "".join([c for c in glyphs if c.isupper()])
-            lc_glyphs = "".join([c for c in glyphs if c.islower()])
+            uc_glyphs, lc_glyphs = _case_glyphs(glyphs)
 
         if case == "any_og":
             # case "any_og" means any unmodified words from vocab
             if glyphs:
                 # return all vocab words we can display with glyphs as is
-                return _findall_recase(wc_str, f"[{glyphs}]+")
+                return _findall_glyphs(wc_str, glyphs)
             else:
                 # return all vocab words
-                return wc_str.splitlines()
+                return _wordcount_str_to_soa(wc_str)
         elif case == "lc":
             if glyphs:
                 _check_lc_glyphs(lc_glyphs, case)
                 # return words that are lowercase in the vocab and can be displayed with glyphs
-                return _findall_recase(wc_str, f"[{lc_glyphs}]+")
+                return _findall_glyphs(wc_str, lc_glyphs)
             else:
                 # return words that are lowercase in the vocab
                 return _findall_recase(wc_str, r"\p{Ll}+")
@@ -189,8 +263,8 @@ def _filter_case(wc_str, case, glyphs, bicameral):
             if glyphs:
                 # return all vocab words, lowercased, which can be displayed with glyphs
                 _check_lc_glyphs(lc_glyphs, case)
-                return _findall_recase(
-                    wc_str, f"[{lc_glyphs}{lc_glyphs.upper()}]+", change_case="lc"
+                return _findall_glyphs(
+                    wc_str, lc_glyphs + lc_glyphs.upper(), change_case="lc"
                 )
             else:
                 # return all vocab words, lowercased
@@ -201,10 +275,11 @@ def _filter_case(wc_str, case, glyphs, bicameral):
                 _check_lc_glyphs(lc_glyphs, case)
                 _check_uc_glyphs(uc_glyphs, case)
 
-                return _findall_recase(
+                return _findall_glyphs(
                     wc_str,
-                    f"[{uc_glyphs}{uc_glyphs.lower()}][{lc_glyphs}]*",
+                    lc_glyphs,
                     change_case="cap",
+                    initial_glyphs=uc_glyphs + uc_glyphs.lower(),
                 )
             else:
                 # return words that are lowercase or capitalized in vocab, made capitalized
@@ -214,7 +289,7 @@ def _filter_case(wc_str, case, glyphs, bicameral):
                 # return words that are capitalized in the vocab and can be displayed with glyphs
                 _check_lc_glyphs(lc_glyphs, case)
                 _check_uc_glyphs(uc_glyphs, case)
-                return _findall_recase(wc_str, f"[{uc_glyphs}][{lc_glyphs}]*")
+                return _findall_glyphs(wc_str, lc_glyphs, initial_glyphs=uc_glyphs)
             else:
                 # return words that are capitalized in the vocab
                 return _findall_recase(wc_str, r"\p{Lu}\p{Ll}*")
@@ -224,10 +299,11 @@ def _filter_case(wc_str, case, glyphs, bicameral):
                 # return all vocab words, made capitalized, which can be displayed with glyphs
                 _check_lc_glyphs(lc_glyphs, case)
                 _check_uc_glyphs(uc_glyphs, case)
-                return _findall_recase(
+                return _findall_glyphs(
                     wc_str,
-                    f"[{uc_glyphs}{uc_glyphs.lower()}][{lc_glyphs}{lc_glyphs.upper()}]*",
+                    lc_glyphs + lc_glyphs.upper(),
                     change_case="cap",
+                    initial_glyphs=uc_glyphs + uc_glyphs.lower(),
                 )
             else:
                 # return all vocab words, made capitalized
@@ -246,7 +322,7 @@ def _filter_case(wc_str, case, glyphs, bicameral):
                     wc_str,
                     no_camel
                     + no_double_upper_lower
-                    + f"[{uc_glyphs}{uc_glyphs.lower()}]+",
+                    + f"[{_char_class(uc_glyphs + uc_glyphs.lower())}]+",
                     change_case="uc",
                 )
             else:
@@ -260,7 +336,7 @@ def _filter_case(wc_str, case, glyphs, bicameral):
             if glyphs:
                 # return words that are uppercase in the vocab and can be displayed with glyphs
                 _check_uc_glyphs(uc_glyphs, case)
-                return _findall_recase(wc_str, f"[{uc_glyphs}]+")
+                return _findall_glyphs(wc_str, uc_glyphs)
             else:
                 # return words that are uppercase in the vocab
                 return _findall_recase(wc_str, r"\p{Lu}+")
@@ -269,10 +345,8 @@ def _filter_case(wc_str, case, glyphs, bicameral):
                 # return all vocab words, made uppercase, which can be displayed with glyphs
                 # even uppercase camelcase words
                 _check_uc_glyphs(uc_glyphs, case)
-                return _findall_recase(
-                    wc_str,
-                    f"[{uc_glyphs}{uc_glyphs.lower()}]+",
-                    change_case="uc",
+                return _findall_glyphs(
+                    wc_str, uc_glyphs + uc_glyphs.lower(), change_case="uc"
                 )
             else:
                 # return all vocab words, made uppercase
@@ -281,13 +355,31 @@ def _filter_case(wc_str, case, glyphs, bicameral):
             raise ValueError(f"Invalid case option: {case}")
 
 
+@lru_cache(maxsize=4096)
+def _compile(pattern: str) -> regex.Pattern:
+    """
+    Compile a pattern and cache it, so we don't depend on the size of the `regex`
+    module's internal cache.
+    """
+    return regex.compile(pattern)
+
+
+@lru_cache(maxsize=4096)
+def _char_class(chars: str) -> str:
+    """
+    Build the body of a character class from chars, deduplicated, sorted and escaped, so
+    that the same set of glyphs always produces the same pattern.
+    """
+    return "".join(regex.escape(c) for c in sorted(set(chars)))
+
+
 def _check_pos_int(i, name):
     if not isinstance(i, int) or i < 0:
         raise ValueError(f"{name} must be a positive integer")
 
 
 def _check_alpha(s, name):
-    if not s.isalpha():
+    if not isinstance(s, str) or not s.isalpha():
         raise ValueError(f"{name} must be a string of alphabetic characters")
 
 
@@ -296,30 +388,115 @@ def _check_uc_glyphs(uc_glyphs, case):
         raise FilterError("case='{case}' but no uppercase glyphs found")
 
 
+@lru_cache(maxsize=4096)
+def _case_glyphs(glyphs: str) -> tuple[str, str]:
+    """
+    Split glyphs into uppercase and lowercase glyphs, cached since the same glyphs are
+    used for many filters and sentences.
+    """
+
+    uc_glyphs = "".join([c for c in glyphs if c.isupper()])
+    lc_glyphs = "".join([c for c in glyphs if c.islower()])
+    return uc_glyphs, lc_glyphs
+
+
+@lru_cache(maxsize=4096)
+def _sorted_glyphs(glyphs: str) -> str:
+    """
+    Deduplicate and sort glyphs, so the same set of glyphs always uses the same cache
+    entries, whatever order it was given in.
+    """
+
+    return "".join(sorted(set(glyphs)))
+
+
 def _check_lc_glyphs(lc_glyphs, case):
     if not lc_glyphs:
         raise FilterError("case='{case}' but no lowercase glyphs found")
 
 
-@lru_cache(maxsize=None)
-def _findall_recase(wc_str: str, pattern: str, change_case: str = "none") -> list[str]:
+@lru_cache(maxsize=_MAX_FILTER_RESULTS)
+def _findall_recase(
+    wc_str: str, pattern: str, change_case: str = "none"
+) -> tuple[tuple[str, ...], array]:
     """
     Find all words in wordcount string that match pattern, and optionally change case.
+    Returns a tuple of the (recased) words and a parallel array of their counts.
     """
 
+    words, counts = _wordcount_str_to_soa(wc_str)
+
     if pattern == "all":
-        lines = wc_str.splitlines()
+        indices = range(len(words))
     else:
-        p = regex.compile(rf"^{pattern}\t\d+$", regex.MULTILINE)
-        lines = regex.findall(p, wc_str)
+        # str.isascii() is O(1), CPython keeps track of it for each string
+        if wc_str.isascii():
+            fullmatch = _compile_ascii(pattern).fullmatch
+        else:
+            fullmatch = _compile(pattern).fullmatch
+        indices = [i for i, w in enumerate(words) if fullmatch(w)]
+
+    return _recase(words, counts, indices, change_case)
+
+
+@lru_cache(maxsize=4096)
+def _compile_ascii(pattern: str) -> re.Pattern | regex.Pattern:
+    """
+    Compile a pattern for matching ASCII-only words. Unicode letter properties are
+    swapped for ASCII classes and compiled with `re`, which is faster than `regex` for
+    these. Falls back to `regex` if the pattern needs anything else.
+    """
+
+    ascii_pattern = pattern.replace(r"\p{Ll}", "[a-z]").replace(r"\p{Lu}", "[A-Z]")
+    if r"\p" in ascii_pattern:
+        return _compile(pattern)
+
+    try:
+        return re.compile(ascii_pattern)
+    except re.error:
+        return _compile(pattern)
+
+
+@lru_cache(maxsize=_MAX_FILTER_RESULTS)
+def _findall_glyphs(
+    wc_str: str,
+    glyphs: str,
+    change_case: str = "none",
+    initial_glyphs: str | None = None,
+) -> tuple[tuple[str, ...], array]:
+    """
+    Find all words in wordcount string made only of glyphs, and optionally change case.
+    If initial_glyphs is set, the first character of the word must be in initial_glyphs
+    instead. Returns a tuple of the (recased) words and a parallel array of their counts.
+    """
+
+    words, counts = _wordcount_str_to_soa(wc_str)
+
+    # set.issuperset loops over the characters of the word in C
+    has_glyphs = frozenset(glyphs).issuperset
+    if initial_glyphs is None:
+        indices = [i for i, w in enumerate(words) if has_glyphs(w)]
+    else:
+        initial = frozenset(initial_glyphs)
+        indices = [
+            i for i, w in enumerate(words) if w[0] in initial and has_glyphs(w[1:])
+        ]
+
+    return _recase(words, counts, indices, change_case)
+
+
+def _recase(words, counts, indices, change_case):
+    """
+    Gather words and counts at indices, optionally changing the case of the words.
+    """
 
-    # we can actually just transform case of whole line since it ignores whitespace
-    # and numerals
     if change_case == "uc":
-        return [line.upper() for line in lines]
+        words_cased = tuple(words[i].upper() for i in indices)
     elif change_case == "lc":
-        return [line.lower() for line in lines]
+        words_cased = tuple(words[i].lower() for i in indices)
     elif change_case == "cap":
-        return [line.capitalize() for line in lines]
+        words_cased = tuple(words[i].capitalize() for i in indices)
     else:
-        return list(lines)
+        words_cased = tuple(words[i] for i in indices)
+
+    return words_cased, array("Q", (counts[i] for i in indices))
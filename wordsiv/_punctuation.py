@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from itertools import accumulate
 import random
 
+from ._choices import _choice_cum
+
 DEFAULT_PUNCTUATION = {
     "en": {
         "insert": {
@@ -62,18 +66,42 @@ DEFAULT_PUNCTUATION = {
 }
 
 
-def _random_available(option_weight, glyphs: str | None, rand, rnd_punc: float):
-    punc_prob = {
+@lru_cache(maxsize=4096)
+def _available_options(
+    option_weight: tuple[tuple[str | tuple[str, str], float], ...],
+    glyphs: str | None,
+    rnd_punc: float,
+) -> tuple[tuple[str | tuple[str, str], ...], tuple[float, ...]]:
+    """
+    Return the punctuation options we have glyphs for, and their cumulative weights
+    (adjusted by rnd_punc) for random.choices. Options stay in the order of the
+    punctuation dict, so that the choice is repeatable with a seed.
+    """
+
+    # we aren't strict about having spaces, hence glyphs + ' '
+    glyph_set = frozenset(glyphs + " ") if glyphs else None
+
+    punc_prob = [
         (punc, (1 - rnd_punc) * prob + rnd_punc * 1)
-        for punc, prob in option_weight.items()
+        for punc, prob in option_weight
         # if glyphs is set, check if we have the glyphs we need to punctuate
-        # we aren't strict about having spaces, hence glyphs + ' '
-        if not glyphs or all(c in glyphs + " " for c in punc)
-    }
+        if glyph_set is None or glyph_set.issuperset("".join(punc))
+    ]
 
     if punc_prob:
         options, weights = zip(*punc_prob)
-        return rand.choices(options, weights=weights, k=1)[0]
+        return options, tuple(accumulate(weights))
+    else:
+        return (), ()
+
+
+def _random_available(option_weight, glyphs: str | None, rand, rnd_punc: float):
+    options, cum_weights = _available_options(
+        tuple(option_weight.items()), glyphs, rnd_punc
+    )
+
+    if options:
+        return _choice_cum(rand, options, cum_weights)
     else:
         return None
 
@@ -116,9 +144,11 @@ def _punctuate(
         # put "insert" punctuation in place of a space
         separators = [" "] * (len(words) - 1)
         separators[insert_index - 1] = insert
-        sent = "".join(
-            [t for pair in zip(words, separators) for t in pair] + [words[-1]]
-        )
+        # interleave words and separators with slice assignment
+        tokens = [""] * (2 * len(words) - 1)
+        tokens[0::2] = words
+        tokens[1::2] = separators
+        sent = "".join(tokens)
     else:
         sent = " ".join(words)
 
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from ._filter import _filter_wordcount
+from ._filter import (
+    FilterError,
+    _filter_wordcount,
+    _normalize_substrings,
+    _sorted_glyphs,
+    _wordcount_str_to_soa,
+)
 from importlib.abc import Traversable
 import regex
 
+# formats of the first line of vocab data: "word<tab>count" or just "word"
+_WC_TSV_RE = regex.compile(r"[[:alpha:]]+\t\d+$")
+_WC_WORDS_RE = regex.compile(r"[[:alpha:]]+$")
+
 
 class VocabEmptyError(Exception):
     pass
@@ -75,28 +85,111 @@ class Vocab:
     def wordcount_str(self) -> str:
         """Returns a TSV-formatted string with words and counts."""
 
-        firstline = self.data.partition("\n")[0]
+        data = self.data
+
+        # only match the first line, without copying it out. A failed match over all of
+        # the data would scan the whole string for the "\t" before giving up.
+        end = data.find("\n")
+        if end < 0:
+            end = len(data)
 
-        if regex.match(r"[[:alpha:]]+\t\d+$", firstline):
+        if _WC_TSV_RE.match(data, 0, end):
             # if we have counts, return the original string
-            return self.data
-        elif regex.match(r"[[:alpha:]]+$", firstline):
+            return data
+        elif _WC_WORDS_RE.match(data, 0, end):
             # if we just have newline-delimited words, add counts of 1
-            return _add_counts_to_wordcount_str(self.data)
+            return _add_counts_to_wordcount_str(data)
         else:
             raise VocabFormatError(
                 "The vocab file is formatted incorrectly. "
                 "Should be a TSV file with words and counts as columns, or a newline-delimited list of words."
             )
 
+    @property
+    def words(self) -> tuple[str, ...]:
+        """Returns a tuple of the words, in the same order as `counts`."""
+
+        return _wordcount_str_to_soa(self.wordcount_str)[0]
+
+    @property
+    def counts(self) -> memoryview:
+        """Returns a read-only view of the word counts, in the same order as `words`."""
+
+        # the array is cached and shared by every filter, so don't let callers change it
+        return memoryview(_wordcount_str_to_soa(self.wordcount_str)[1]).toreadonly()
+
     @property
     def wordcount(self) -> tuple[tuple[str, int], ...]:
         """Returns a tuple of tuples with words and counts."""
 
         return _wordcount_str_to_wordcount_tuple(self.wordcount_str)
 
-    def filter(self, **kwargs):
-        return _filter_wordcount(self.wordcount_str, self.bicameral, **kwargs)
+    def filter(
+        self,
+        glyphs=None,
+        case="any",
+        min_wl=0,
+        max_wl=None,
+        wl=None,
+        contains=None,
+        inner=None,
+        startswith=None,
+        endswith=None,
+        regexp=None,
+    ):
+        """
+        Returns a tuple of (word, count) tuples matching the filter arguments.
+
+        Arguments are normalized and passed positionally to the cached filter, so the
+        same filter always hits the same cache entry, however it was called.
+        """
+
+        if isinstance(contains, list):
+            contains = tuple(contains)
+        if isinstance(inner, list):
+            inner = tuple(inner)
+
+        # order and duplicates of glyphs or substrings don't change the result, so
+        # normalize them to use one cache entry
+        key_glyphs = _sorted_glyphs(glyphs) if glyphs else glyphs
+        key_contains = _normalize_substrings(contains, "contains")
+        key_inner = _normalize_substrings(inner, "inner")
+
+        try:
+            return _filter_wordcount(
+                self.wordcount_str,
+                self.bicameral,
+                key_glyphs,
+                case,
+                min_wl,
+                max_wl,
+                wl,
+                key_contains,
+                key_inner,
+                startswith,
+                endswith,
+                regexp,
+            )
+        except FilterError:
+            if (key_glyphs, key_contains, key_inner) == (glyphs, contains, inner):
+                raise
+
+        # the cached filter saw the normalized arguments, so filter again without the
+        # cache to raise the error with the arguments as they were passed
+        return _filter_wordcount.__wrapped__(
+            self.wordcount_str,
+            self.bicameral,
+            glyphs,
+            case,
+            min_wl,
+            max_wl,
+            wl,
+            contains,
+            inner,
+            startswith,
+            endswith,
+            regexp,
+        )
 
 
 @lru_cache(maxsize=None)
@@ -107,9 +200,7 @@ def _read_file(file):
 
 @lru_cache(maxsize=None)
 def _wordcount_str_to_wordcount_tuple(wordcount_str):
-    return tuple(
-        (line.split()[0], int(line.split()[1])) for line in wordcount_str.splitlines()
-    )
+    return tuple(zip(*_wordcount_str_to_soa(wordcount_str)))
 
 
 @lru_cache(maxsize=None)